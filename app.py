@@ -1,10 +1,19 @@
 import os
 import time
+import hashlib
 import logging
+import threading
+import orjson
+from datetime import datetime
 from functools import wraps
-from flask import Flask, request, jsonify, g
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request, jsonify, g, make_response
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import http_date
 from flask_cors import CORS
-from flask_restx import Api, Resource, fields, reqparse
+from flask_compress import Compress
+from flask_restx import Api, Model, Resource, fields, reqparse
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
@@ -18,6 +27,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def output_json(data, code, headers=None):
+    """Flask-RESTX JSON representation backed by orjson."""
+    response = make_response(orjson.dumps(data, default=DefaultJSONProvider.default), code)
+    response.headers.extend(headers or {})
+    return response
+
+# Response models - built once at import and registered on each Api instance
+manga_search_model = Model('MangaSearch', {
+    'id': fields.String(required=True, description='Unique manga identifier'),
+    'title': fields.String(required=True, description='Manga title'),
+    'image': fields.String(required=True, description='Manga cover image URL'),
+    'total_chapter': fields.Integer(required=True, description='Total number of chapters'),
+    'rating': fields.Float(required=True, description='Manga rating')
+})
+
+manga_model = Model('Manga', {
+    'id': fields.String(required=True, description='Unique manga identifier'),
+    'title': fields.String(required=True, description='Manga title'),
+    'image': fields.String(required=True, description='Manga cover image URL'),
+    'total_chapter': fields.Integer(required=True, description='Total number of chapters'),
+    'rating': fields.Float(required=True, description='Manga rating')
+})
+
+manga_detail_model = Model('MangaDetail', {
+    'id': fields.String(required=True, description='Unique manga identifier'),
+    'title': fields.String(required=True, description='Manga title'),
+    'image': fields.String(required=True, description='Manga cover image URL'),
+    'description': fields.String(required=True, description='Short description'),
+    'synopsis': fields.String(required=True, description='Full synopsis'),
+    'type': fields.String(required=True, description='Manga type (e.g., Manga, Manhwa)'),
+    'status': fields.String(required=True, description='Publication status'),
+    'year': fields.Integer(required=True, description='Publication year'),
+    'genre': fields.List(fields.String, required=True, description='List of genres'),
+    'chapter': fields.Integer(required=True, description='Total chapters'),
+    'chapter_list': fields.List(fields.String, required=True, description='List of chapter URLs'),
+    'author': fields.String(required=True, description='Manga author'),
+    'rating': fields.String(required=True, description='Manga rating'),
+    'views': fields.Integer(required=True, description='Total views')
+})
+
+chapter_images_model = Model('ChapterImages', {
+    'title': fields.String(required=True, description='Chapter title'),
+    'chapter': fields.Raw(required=True, description='Chapter images organized by servers')
+})
+
+error_model = Model('Error', {
+    'error': fields.String(required=True, description='Error message'),
+    'code': fields.Integer(description='Error code'),
+    'timestamp': fields.DateTime(description='Error timestamp')
+})
+
+health_model = Model('Health', {
+    'status': fields.String(required=True, description='API status'),
+    'timestamp': fields.DateTime(required=True, description='Check timestamp'),
+    'version': fields.String(required=True, description='API version'),
+    'cache_status': fields.String(description='Cache system status'),
+    'rate_limit_status': fields.String(description='Rate limiting status')
+})
+
+# Field names of the scraped models - scraper output is already typed, so
+# responses are built by projection instead of a full marshal
+manga_fields = tuple(manga_model)
+manga_detail_fields = tuple(manga_detail_model)
+chapter_images_fields = tuple(chapter_images_model)
+
+# Response headers are constant, so build them once instead of per request
+base_headers = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block'
+}
+cacheable_headers = {**base_headers, 'Cache-Control': 'public, max-age=300'}
+
 def create_app(config_name=None):
     """Application factory pattern."""
     if config_name is None:
@@ -25,9 +116,11 @@ def create_app(config_name=None):
 
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = OrjsonProvider(app)
         
         # Initialize extensions
     CORS(app)
+    Compress(app)
 
         # Initialize rate limiter
     limiter = Limiter(
@@ -35,6 +128,7 @@ def create_app(config_name=None):
         key_func=get_remote_address,
         default_limits=[app.config['RATELIMIT_DEFAULT']],
         storage_uri=app.config['RATELIMIT_STORAGE_URL'],
+        strategy=app.config['RATELIMIT_STRATEGY'],
         headers_enabled=app.config['RATELIMIT_HEADERS_ENABLED']
     )
     
@@ -47,76 +141,33 @@ def create_app(config_name=None):
         version='1.0',
         title='Mangaku API',
         description='A high-performance REST API for scraping manga data from Mangaaku.com with rate limiting and caching',
-        doc='/docs/',
+        doc='/docs/' if app.config['DEBUG'] else False,  # Swagger UI is dev-only
         contact_email='badzzhaxor@gmail.com',
         license='MIT'
     )
     
+    api.representations['application/json'] = output_json
+    
     # Create namespaces
     manga_ns = api.namespace('manga', description='Manga operations')
     search_ns = api.namespace('search', description='Search operations')
     read_ns = api.namespace('read', description='Chapter reading operations')
     health_ns = api.namespace('health', description='Health check and monitoring')
     
-    # Define response models
-    manga_search_model = api.model('MangaSearch', {
-        'id': fields.String(required=True, description='Unique manga identifier'),
-        'title': fields.String(required=True, description='Manga title'),
-        'image': fields.String(required=True, description='Manga cover image URL'),
-        'total_chapter': fields.Integer(required=True, description='Total number of chapters'),
-        'rating': fields.Float(required=True, description='Manga rating')
-    })
-    
-    manga_model = api.model('Manga', {
-        'id': fields.String(required=True, description='Unique manga identifier'),
-        'title': fields.String(required=True, description='Manga title'),
-        'image': fields.String(required=True, description='Manga cover image URL'),
-        'total_chapter': fields.Integer(required=True, description='Total number of chapters'),
-        'rating': fields.Float(required=True, description='Manga rating')
-    })
-    
-    manga_detail_model = api.model('MangaDetail', {
-        'id': fields.String(required=True, description='Unique manga identifier'),
-        'title': fields.String(required=True, description='Manga title'),
-        'image': fields.String(required=True, description='Manga cover image URL'),
-        'description': fields.String(required=True, description='Short description'),
-        'synopsis': fields.String(required=True, description='Full synopsis'),
-        'type': fields.String(required=True, description='Manga type (e.g., Manga, Manhwa)'),
-        'status': fields.String(required=True, description='Publication status'),
-        'year': fields.Integer(required=True, description='Publication year'),
-        'genre': fields.List(fields.String, required=True, description='List of genres'),
-        'chapter': fields.Integer(required=True, description='Total chapters'),
-        'chapter_list': fields.List(fields.String, required=True, description='List of chapter URLs'),
-        'author': fields.String(required=True, description='Manga author'),
-        'rating': fields.String(required=True, description='Manga rating'),
-        'views': fields.Integer(required=True, description='Total views')
-    })
-    
-    chapter_images_model = api.model('ChapterImages', {
-        'title': fields.String(required=True, description='Chapter title'),
-        'chapter': fields.Raw(required=True, description='Chapter images organized by servers')
-    })
-    
-    error_model = api.model('Error', {
-        'error': fields.String(required=True, description='Error message'),
-        'code': fields.Integer(description='Error code'),
-        'timestamp': fields.DateTime(description='Error timestamp')
-    })
-    
-    health_model = api.model('Health', {
-        'status': fields.String(required=True, description='API status'),
-        'timestamp': fields.DateTime(required=True, description='Check timestamp'),
-        'version': fields.String(required=True, description='API version'),
-        'cache_status': fields.String(description='Cache system status'),
-        'rate_limit_status': fields.String(description='Rate limiting status')
-    })
-    
-    # Parser for query parameters
+    for model in (manga_search_model, manga_model, manga_detail_model,
+                  chapter_images_model, error_model, health_model):
+        api.add_model(model.name, model)
+    
+    # Query parameter parsers - used for API docs only, handlers read request.args directly
     manga_list_parser = reqparse.RequestParser()
     manga_list_parser.add_argument('page', type=int, default=1, help='Page number for pagination')
     manga_list_parser.add_argument('limit', type=int, default=app.config['DEFAULT_PAGE_SIZE'], 
                                  help=f'Items per page (max {app.config["MAX_PAGE_SIZE"]})')
     
+    batch_parser = reqparse.RequestParser()
+    batch_parser.add_argument('ids', type=str, required=True,
+                              help=f'Comma-separated manga ids (max {app.config["MAX_BATCH_SIZE"]})')
+    
     search_parser = reqparse.RequestParser()
     search_parser.add_argument('query', type=str, required=True, help='Search query')
     search_parser.add_argument('page', type=int, default=1, help='Page number for pagination')
@@ -127,114 +178,330 @@ def create_app(config_name=None):
     def monitor_performance(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.monotonic()
             g.start_time = start_time
             
             try:
                 result = f(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 logger.info(f"{request.endpoint} - {request.method} - Duration: {duration:.3f}s")
                 return result
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 logger.error(f"{request.endpoint} - {request.method} - Error: {str(e)} - Duration: {duration:.3f}s")
                 raise
         return decorated_function
     
     # Cache key generators
-    def make_cache_key(*args, **kwargs):
-        """Generate cache key for requests."""
-        path = request.path
-        args_str = str(sorted(request.args.items()))
-        return f"request:{path}:{hash(args_str)}"
+    default_page_size = app.config['DEFAULT_PAGE_SIZE']
+
+    def make_cache_key(path=None, request_args=None):
+        """Generate a stable, cross-process cache key for requests."""
+        path = request.path if path is None else path
+        request_args = request.args if request_args is None else request_args
+        canonical = (f"page={request_args.get('page', '1')}"
+                     f"&limit={request_args.get('limit', default_page_size)}"
+                     f"&query={request_args.get('query', '')}")
+        digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+        return f"request:{path}:{digest}"
+    
+    def serialize_response(data, field_names):
+        """Project a handler result onto its model fields and serialize it to JSON bytes."""
+        if isinstance(data, list):
+            return orjson.dumps([{name: item.get(name) for name in field_names} for item in data])
+        return orjson.dumps({name: data.get(name) for name in field_names})
+    
+    def json_response(body):
+        """Wrap already-serialized JSON bytes in a response, skipping marshalling."""
+        return Response(body, status=200, mimetype='application/json')
+    
+    def get_cached_response(cache_key):
+        """Return a cached response body, recording when it was generated."""
+        record_request(cache_key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            return None
+        g.cache_generated_at = entry['generated_at']
+        return entry['body']
+    
+    def get_cached_responses(cache_keys):
+        """Return the cached response bodies of several keys in one round-trip, None where missing."""
+        for cache_key in cache_keys:
+            record_request(cache_key)
+        entries = cache.get_many(*cache_keys)
+        generated = [entry['generated_at'] for entry in entries if entry is not None]
+        if generated:
+            g.cache_generated_at = min(generated)  # Report the oldest item served
+        return [entry['body'] if entry is not None else None for entry in entries]
     
-    # Create optimized mangaku instance with config settings
+    # Hot keys: requests per key counted in minute buckets over a sliding window;
+    # keys that keep being requested are cached longer to spare the upstream.
+    # Hits count too, a cached key only misses again once its TTL has run out
+    request_buckets = {}
+    request_lock = threading.Lock()
+    
+    def record_request(cache_key):
+        """Count a request for a key in the current minute bucket, discarding expired buckets."""
+        minute = int(time.monotonic() // 60)
+        oldest = minute - app.config['HOT_KEY_WINDOW'] + 1
+        with request_lock:
+            buckets = request_buckets.get(cache_key)
+            if buckets is None:
+                if len(request_buckets) >= app.config['HOT_KEY_CACHE_SIZE']:
+                    request_buckets.clear()
+                buckets = request_buckets[cache_key] = {}
+            buckets[minute] = buckets.get(minute, 0) + 1
+            for bucket in [bucket for bucket in buckets if bucket < oldest]:
+                del buckets[bucket]
+    
+    def is_hot(cache_key):
+        """Whether a key was requested at least the hot threshold within the window."""
+        oldest = int(time.monotonic() // 60) - app.config['HOT_KEY_WINDOW'] + 1
+        with request_lock:
+            buckets = request_buckets.get(cache_key, {})
+            total = sum(count for bucket, count in buckets.items() if bucket >= oldest)
+        return total >= app.config['HOT_KEY_THRESHOLD']
+    
+    def cache_response(cache_key, body, policy):
+        """Cache a response body with a TTL scaled by how long it took to generate."""
+        generated_at = time.time()
+        min_ttl, max_ttl = app.config['CACHE_TTL_POLICY'][policy]
+        generation_time = time.monotonic() - g.start_time
+        ttl = int(min(max_ttl, max(min_ttl, generation_time * app.config['CACHE_TTL_BUFFER_FACTOR'])))
+        if is_hot(cache_key):
+            ttl *= app.config['HOT_KEY_TTL_FACTOR']
+        entry = {'body': body, 'generated_at': generated_at}
+        cache.set(cache_key, entry, timeout=ttl)
+        cache.set(f"stale:{cache_key}", entry, timeout=app.config['CACHE_STALE_TIMEOUT'])
+        g.cache_generated_at = generated_at
+    
+    def get_stale_response(cache_key):
+        """Return the last good response body for a failed request if the caller opted in."""
+        if request.args.get('allow_stale') != '1':
+            return None
+        entry = cache.get(f"stale:{cache_key}")
+        if entry is None:
+            return None
+        g.cache_generated_at = entry['generated_at']
+        g.cache_stale = True
+        return entry['body']
+    
+    # Single-flight: concurrent cache misses for the same key share one upstream scrape
+    inflight_requests = {}
+    inflight_lock = threading.Lock()
+    
+    def fetch_once(cache_key, policy, field_names, fetch):
+        """Fetch, serialize and cache once per key; concurrent callers wait and share the body."""
+        with inflight_lock:
+            call = inflight_requests.get(cache_key)
+            is_leader = call is None
+            if is_leader:
+                call = inflight_requests[cache_key] = {'event': threading.Event(), 'result': None}
+        
+        if not is_leader:
+            call['event'].wait(app.config['REQUEST_TIMEOUT'])
+            return call['result']
+        
+        try:
+            data = fetch()
+            if data is not None:
+                call['result'] = serialize_response(data, field_names)
+                cache_response(cache_key, call['result'], policy)
+        finally:
+            with inflight_lock:
+                del inflight_requests[cache_key]
+            call['event'].set()
+        return call['result']
+    
+    def abort_or_stale(cache_key, code, message):
+        """Serve the last good response if the caller opted in, otherwise abort."""
+        stale = get_stale_response(cache_key)
+        if stale is not None:
+            return json_response(stale)
+        api.abort(code, message)
+    
+    def guarded(f):
+        """Turn unexpected handler errors into a generic 500, falling back to stale data."""
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception:
+                logger.exception(f"Unhandled error in {request.endpoint}")
+                if 'cache_key' in g:
+                    return abort_or_stale(g.cache_key, 500, "Internal server error")
+                api.abort(500, "Internal server error")
+        return decorated_function
+    
+    # Create a single mangaku instance so its pooled session is reused across requests
+    app.extensions['mangaku'] = Mangaku(
+        max_retries=app.config.get('MAX_RETRIES', 3),
+        timeout=app.config.get('REQUEST_TIMEOUT', 120),
+        pool_connections=app.config.get('CONNECTION_POOL_SIZE', 20),
+        pool_maxsize=app.config.get('CONNECTION_POOL_MAXSIZE', 50),
+        dns_cache_ttl=app.config.get('DNS_CACHE_TTL', 300),
+        http2=app.config.get('HTTP2_ENABLED', False)
+    )
+
     def get_mangaku_instance():
-        """Create Mangaku instance with configuration settings."""
-        return Mangaku(
-            max_retries=app.config.get('MAX_RETRIES', 3),
-            timeout=app.config.get('REQUEST_TIMEOUT', 120),
-            pool_connections=app.config.get('CONNECTION_POOL_SIZE', 20),
-            pool_maxsize=app.config.get('CONNECTION_POOL_MAXSIZE', 50)
-        )
+        """Return the shared Mangaku instance bound to this app."""
+        return app.extensions['mangaku']
+    
+    def get_int_arg(name, default):
+        """Read an integer query parameter, rejecting values that are present but not integers."""
+        value = request.args.get(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            api.abort(400, "Input payload validation failed", errors={name: f"{name} must be an integer"})
     
     # Routes
     @manga_ns.route('')
     class MangaList(Resource):
         @api.doc('get_manga_list')
         @api.expect(manga_list_parser)
-        @api.marshal_list_with(manga_model)
-        @api.response(200, 'Success')
+        @api.response(200, 'Success', [manga_model])
         @api.response(429, 'Rate limit exceeded')
         @api.response(500, 'Internal Server Error')
         @limiter.limit("50 per minute")
-        @cache.cached(timeout=300, key_prefix=make_cache_key)
         @monitor_performance
+        @guarded
         def get(self):
             """Get list of manga with pagination and caching"""
-            args = manga_list_parser.parse_args()
-            page = args['page']
-            limit = min(args['limit'], app.config['MAX_PAGE_SIZE'])  # Enforce max limit
+            cache_key = g.cache_key = make_cache_key()
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return json_response(cached)
+            
+            page = get_int_arg('page', 1)
+            limit = min(get_int_arg('limit', default_page_size), app.config['MAX_PAGE_SIZE'])  # Enforce max limit
             
+            mangaku = get_mangaku_instance()
+            body = fetch_once(cache_key, 'manga_list', manga_fields,
+                              lambda: mangaku.get_manga_list(page, limit))
+            
+            if body is None:
+                return abort_or_stale(cache_key, 500, "Failed to fetch manga list")
+            
+            return json_response(body)
+    
+    def get_batch_ids():
+        """Parse and validate the unique, non-empty manga ids of a batch request in order."""
+        if 'batch_ids' not in g:
+            ids = (manga_id.strip() for manga_id in request.args.get('ids', '').split(','))
+            manga_ids = list(dict.fromkeys(manga_id for manga_id in ids if manga_id))
+            if not manga_ids:
+                api.abort(400, "No manga ids given")
+            if len(manga_ids) > app.config['MAX_BATCH_SIZE']:
+                api.abort(400, f"At most {app.config['MAX_BATCH_SIZE']} ids per batch")
+            g.batch_ids = manga_ids
+        return g.batch_ids
+    
+    def batch_cost():
+        """Charge one rate limit hit per requested manga, invalid batches are rejected before any charge."""
+        return len(get_batch_ids())
+    
+    def fetch_batch_item(cache_key, manga_id, start_time):
+        """Fetch one uncached batch item in a worker thread through the single-flight path."""
+        with app.app_context():
+            g.start_time = start_time
             try:
                 mangaku = get_mangaku_instance()
-                manga_list = mangaku.get_manga_list(page, limit)
-                
-                if manga_list is None:
-                    api.abort(500, "Failed to fetch manga list")
-                
-                return manga_list
+                return fetch_once(cache_key, 'manga_detail', manga_detail_fields,
+                                  lambda: mangaku.get_manga_detail(manga_id))
             except Exception as e:
-                logger.error(f"Error in get_manga_list: {str(e)}")
-                api.abort(500, f"Internal server error: {str(e)}")
+                logger.error(f"Error fetching batch item {manga_id}: {str(e)}")
+                return None
+    
+    @manga_ns.route('/batch')
+    class MangaBatch(Resource):
+        @api.doc('get_manga_batch')
+        @api.expect(batch_parser)
+        @api.response(200, 'Success', [manga_detail_model])
+        @api.response(400, 'Invalid batch request', error_model)
+        @api.response(404, 'None of the requested manga were found', error_model)
+        @api.response(429, 'Rate limit exceeded')
+        @api.response(500, 'Internal Server Error', error_model)
+        @limiter.limit("30 per minute", cost=batch_cost)
+        @monitor_performance
+        @guarded
+        def get(self):
+            """Get details for several manga at once, fetching uncached ones concurrently"""
+            manga_ids = get_batch_ids()
+            
+            # Items are cached under the same keys as the single detail endpoint
+            cache_keys = [make_cache_key(f"/manga/{manga_id}", {}) for manga_id in manga_ids]
+            results = get_cached_responses(cache_keys)
+            missing = [i for i, result in enumerate(results) if result is None]
+            
+            if missing:
+                start_time = g.start_time
+                max_workers = min(len(missing), app.config['BATCH_MAX_WORKERS'])
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    fetched = executor.map(lambda i: fetch_batch_item(cache_keys[i], manga_ids[i], start_time),
+                                           missing)
+                    for i, body in zip(missing, fetched):
+                        results[i] = body if body is not None else get_stale_response(cache_keys[i])
+            
+            bodies = [body for body in results if body is not None]
+            if not bodies:
+                # An empty list would be cached downstream like a real result
+                api.abort(404, "None of the requested manga were found")
+            return json_response(b'[' + b','.join(bodies) + b']')
     
     @manga_ns.route('/<string:manga_url>')
     class MangaDetail(Resource):
         @api.doc('get_manga_detail')
-        @api.marshal_with(manga_detail_model)
-        @api.response(200, 'Success')
+        @api.response(200, 'Success', manga_detail_model)
         @api.response(404, 'Manga not found', error_model)
         @api.response(429, 'Rate limit exceeded')
         @api.response(500, 'Internal Server Error', error_model)
         @limiter.limit("30 per minute")
-        @cache.cached(timeout=600, key_prefix=make_cache_key)  # Longer cache for details
         @monitor_performance
+        @guarded
         def get(self, manga_url):
             """Get detailed information about a specific manga with caching"""
-            try:
-                mangaku = get_mangaku_instance()
-                manga_detail = mangaku.get_manga_detail(manga_url)
-                if manga_detail is None:
-                    api.abort(404, "Manga not found")  
-                return manga_detail
-            except Exception as e:
-                logger.error(f"Error in get_manga_detail for {manga_url}: {str(e)}")
-                api.abort(500, f"Internal server error: {str(e)}")
+            cache_key = g.cache_key = make_cache_key()
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return json_response(cached)
+            
+            mangaku = get_mangaku_instance()
+            body = fetch_once(cache_key, 'manga_detail', manga_detail_fields,
+                              lambda: mangaku.get_manga_detail(manga_url))
+            if body is None:
+                return abort_or_stale(cache_key, 404, "Manga not found")
+            return json_response(body)
     
     @read_ns.route('/<path:manga_url>')
     class ChapterImages(Resource):
         @api.doc('get_chapter_images')
-        @api.marshal_with(chapter_images_model)
-        @api.response(200, 'Success')
+        @api.response(200, 'Success', chapter_images_model)
         @api.response(404, 'Chapter not found', error_model)
         @api.response(429, 'Rate limit exceeded')
         @api.response(500, 'Internal Server Error', error_model)
         @limiter.limit("20 per minute")  # More restrictive for image-heavy endpoints
-        @cache.cached(timeout=1800, key_prefix=make_cache_key)  # Longer cache for images
         @monitor_performance
+        @guarded
         def get(self, manga_url):
             """Get chapter images from multiple servers with caching"""
-            try:
-                mangaku = get_mangaku_instance()
-                chapter_data = mangaku.read_manga(manga_url)
-                
-                if chapter_data is None:
-                    api.abort(404, "Chapter not found")
-                
-                return chapter_data
-            except Exception as e:
-                logger.error(f"Error in get_chapter_images for {manga_url}: {str(e)}")
-                api.abort(500, f"Internal server error: {str(e)}")
+            cache_key = g.cache_key = make_cache_key()
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return json_response(cached)
+            
+            mangaku = get_mangaku_instance()
+            body = fetch_once(cache_key, 'chapter', chapter_images_fields,
+                              lambda: mangaku.read_manga(manga_url))
+            
+            if body is None:
+                return abort_or_stale(cache_key, 404, "Chapter not found")
+            
+            return json_response(body)
     
     @health_ns.route('')
     class HealthCheck(Resource):
@@ -245,14 +512,17 @@ def create_app(config_name=None):
         @limiter.exempt  # Exempt health checks from rate limiting
         def get(self):
             """Health check endpoint for monitoring"""
-            from datetime import datetime
-            
             try:
                 # Check cache status
                 cache_status = "healthy"
                 try:
-                    cache.set("health_check", "ok", timeout=10)
-                    cache.get("health_check")
+                    # One PING round-trip on Redis; other backends get a set/get probe
+                    redis_client = getattr(cache.cache, '_write_client', None)
+                    if redis_client is not None:
+                        redis_client.ping()
+                    else:
+                        cache.set("health_check", "ok", timeout=10)
+                        cache.get("health_check")
                 except:
                     cache_status = "unhealthy"
 
@@ -280,31 +550,33 @@ def create_app(config_name=None):
     class SearchManga(Resource):
         @api.doc('search_manga')
         @api.expect(search_parser)
-        @api.marshal_list_with(manga_model)
-        @api.response(200, 'Success')
+        @api.response(200, 'Success', [manga_model])
         @api.response(429, 'Rate limit exceeded')
         @api.response(500, 'Internal Server Error')
         @limiter.limit("30 per minute")
-        @cache.cached(timeout=300, key_prefix=make_cache_key)
         @monitor_performance
+        @guarded
         def get(self):
             """Search manga with pagination and caching"""
-            args = search_parser.parse_args()
-            query = args['query']
-            page = args['page']
-            limit = min(args['limit'], app.config['MAX_PAGE_SIZE'])
+            cache_key = g.cache_key = make_cache_key()
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return json_response(cached)
             
-            try:
-                mangaku = get_mangaku_instance()
-                manga_list = mangaku.search_manga(query, page, limit)
-                
-                if manga_list is None:
-                    api.abort(500, "Failed to fetch manga list")
-                
-                return manga_list
-            except Exception as e:
-                logger.error(f"Error in search_manga: {str(e)}")
-                api.abort(500, f"Internal server error: {str(e)}")
+            query = request.args.get('query')
+            if query is None:
+                api.abort(400, "Search query is required")
+            page = get_int_arg('page', 1)
+            limit = min(get_int_arg('limit', default_page_size), app.config['MAX_PAGE_SIZE'])
+            
+            mangaku = get_mangaku_instance()
+            body = fetch_once(cache_key, 'search', manga_fields,
+                              lambda: mangaku.search_manga(query, page, limit))
+            
+            if body is None:
+                return abort_or_stale(cache_key, 500, "Failed to fetch manga list")
+            
+            return json_response(body)
     
     @health_ns.route('/cache/clear')
     class CacheClear(Resource):
@@ -350,22 +622,30 @@ def create_app(config_name=None):
             'timestamp': time.time()
         }), 504
     
+    # Clients may cache scraped data for a few minutes, never health or admin responses
+    cacheable_endpoints = frozenset(
+        resource.endpoint for resource in (MangaList, MangaBatch, MangaDetail, ChapterImages, SearchManga)
+    )
+    
     # Performance headers middleware
     @app.after_request
     def after_request(response):
         # Add performance headers
         if hasattr(g, 'start_time'):
-            duration = time.time() - g.start_time
+            duration = time.monotonic() - g.start_time
             response.headers['X-Response-Time'] = f"{duration:.3f}s"
         
-        # Add cache headers
-        if request.endpoint and 'get' in request.endpoint.lower():
-            response.headers['Cache-Control'] = 'public, max-age=300'
+        if hasattr(g, 'cache_generated_at'):
+            response.headers['X-Cache-Generated-At'] = http_date(g.cache_generated_at)
+        
+        if g.get('cache_stale'):
+            response.headers['X-Cache'] = 'STALE'
         
-        # Security headers
-        response.headers['X-Content-Type-Options'] = 'nosniff'
-        response.headers['X-Frame-Options'] = 'DENY'
-        response.headers['X-XSS-Protection'] = '1; mode=block'
+        # Security headers, plus Cache-Control on successful data responses
+        if response.status_code == 200 and request.endpoint in cacheable_endpoints:
+            response.headers.update(cacheable_headers)
+        else:
+            response.headers.update(base_headers)
         
         return response
     
@@ -1,5 +1,15 @@
 import os
 from datetime import timedelta
+from urllib.parse import urlsplit
+
+REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379'
+REDIS_SOCKET = os.environ.get('REDIS_SOCKET') or '/var/run/redis/redis.sock'
+
+def redis_db_url(db, unix_scheme='unix'):
+    """Build the URL of one logical Redis DB, preferring the local Unix socket when it exists."""
+    if os.path.exists(REDIS_SOCKET):
+        return f"{unix_scheme}://{REDIS_SOCKET}?db={db}"
+    return urlsplit(REDIS_URL)._replace(path=f"/{db}").geturl()
 
 class Config:
     """Base configuration class."""
@@ -10,19 +20,38 @@ class Config:
     TESTING = False
     
     # Rate Limiting settings
-    RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379'
+    # Rate limit counters (hot, tiny, short-lived) live apart from cached responses
+    RATELIMIT_STORAGE_URL = redis_db_url(1, unix_scheme='redis+unix')
     RATELIMIT_DEFAULT = "100 per hour, 20 per minute"
     RATELIMIT_HEADERS_ENABLED = True
+    RATELIMIT_STRATEGY = "moving-window"  # Atomic Lua rolling window, no fixed-window edge bursts
     
     # Caching settings
     CACHE_TYPE = "RedisCache"
-    CACHE_REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379'
+    CACHE_REDIS_URL = redis_db_url(0)
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes
     CACHE_KEY_PREFIX = "mangaku_api:"
     
+    # Per-endpoint (min, max) TTL in seconds - slow scrapes are cached longer
+    CACHE_TTL_POLICY = {
+        'manga_list': (60, 600),
+        'search': (60, 600),
+        'manga_detail': (120, 1800),
+        'chapter': (600, 7200),
+    }
+    CACHE_TTL_BUFFER_FACTOR = 300  # Seconds of TTL per second spent generating
+    CACHE_STALE_TIMEOUT = 86400  # Keep last good response 24h for ?allow_stale=1 fallback
+    HOT_KEY_WINDOW = 5  # Minute buckets of requests tracked per key
+    HOT_KEY_THRESHOLD = 10  # Requests within the window that mark a key as hot
+    HOT_KEY_TTL_FACTOR = 3  # Hot keys are cached this many times longer
+    HOT_KEY_CACHE_SIZE = 10000
+    
     # Performance settings
     JSONIFY_PRETTYPRINT_REGULAR = False  # Disable pretty printing for performance
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max request size
+    COMPRESS_MIMETYPES = ['application/json']
+    COMPRESS_LEVEL = 4  # Moderate gzip level so compression CPU stays below the savings
+    COMPRESS_BR_LEVEL = 4
     
     # Scraper settings - Increased timeouts to prevent timeout errors
     REQUEST_TIMEOUT = 120  # Increased from 30 to 120 seconds
@@ -30,10 +59,16 @@ class Config:
     SCRAPER_DELAY = 0.5  # Reduced delay between requests
     CONNECTION_POOL_SIZE = 20  # Connection pool size
     CONNECTION_POOL_MAXSIZE = 50  # Max connections per pool
+    DNS_CACHE_TTL = 300  # Seconds to reuse resolved upstream addresses
+    HTTP2_ENABLED = os.environ.get('HTTP2_ENABLED', '').lower() in ('1', 'true')  # Needs httpx[http2]
     
     # Pagination settings
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
+    
+    # Batch settings
+    MAX_BATCH_SIZE = 20  # Max manga ids per /manga/batch request
+    BATCH_MAX_WORKERS = 10  # Concurrent upstream fetches per batch
 
 class DevelopmentConfig(Config):
     """Development configuration."""
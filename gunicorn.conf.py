@@ -0,0 +1,21 @@
+import os
+import multiprocessing
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Worker processes - threaded workers let one process keep many upstream
+# scrapes in flight, since requests releases the GIL while waiting on I/O
+worker_class = "gthread"
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+
+# Timeouts - must outlast the scraper's own read timeout plus retries
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+graceful_timeout = 30
+keepalive = 5
+
+# Logging
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
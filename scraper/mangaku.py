@@ -1,36 +1,131 @@
-from .schema.komik_schema import KomikDetailSchema, KomikSchema
+from .schema.komik_schema import (
+    KomikDetailRecord, KomikDetailSchema, KomikRecord, KomikSchema, serialize_komik, serialize_komik_detail
+)
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from lxml import etree, html
 import urllib3
 from .utils.request_attr import headers
 from .utils.parsing_comic import parse_comic
+from .utils.dns_cache import install_dns_cache
 import re
 import time
+import random
+import asyncio
 import logging
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+try:
+    import httpx
+except ImportError:  # HTTP/2 is optional, requests stays the default client
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for the async multi-page crawl
+    aiohttp = None
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+# Failures raised by either client, so one request path handles both
+_READ_TIMEOUT_ERRORS = (requests.exceptions.ReadTimeout,) + ((httpx.ReadTimeout,) if httpx else ())
+_CONNECT_TIMEOUT_ERRORS = (requests.exceptions.ConnectTimeout,) + ((httpx.ConnectTimeout,) if httpx else ())
+_REQUEST_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+_DIGITS_RE = re.compile(r'\d+')
+_WS_RE = re.compile(r'\s+')
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset', re.IGNORECASE)
+_YEAR_RE = re.compile(r'\d{4}')
+_VIEWS_RE = re.compile(r'(\d*\.?\d+)([KM]?)')
+_VIEWS_MULTIPLIERS = {'': 1, 'K': 1000, 'M': 1000000}
+
+# Manga info fields, compiled once at import
+_INFO_PATTERNS = tuple((key, re.compile(pattern)) for key, pattern in (
+    ("status", r"Status\s+(\w+)"),
+    ("type", r"Type\s+(\w+)"),
+    ("author", r"Author\s+([^P]+?)\s+Posted By"),
+    ("posted_by", r"Posted By\s+(\w+)"),
+    ("posted_on", r"Posted On\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})"),
+    ("updated_on", r"Updated On\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})"),
+    ("views", r"Views\s+(\S+)"),
+))
+
+def _has_class(name):
+    """XPath predicate matching one token of the class attribute, like bs4's class_."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def _card_columns(card_class):
+    """Compile XPaths returning the cards of a listing, then one field of every card each."""
+    # Field columns start from the $cards node-set, so the document is only walked once
+    return (
+        etree.XPath(f"//div[{_has_class(card_class)}]"),
+        etree.XPath("$cards/descendant::a[1]"),
+        etree.XPath("$cards/descendant::img[1]/@src", smart_strings=False),
+        etree.XPath(f"$cards/descendant::div[{_has_class('numscore')}][1]"),
+        etree.XPath(f"$cards/descendant::div[{_has_class('epxs')}][1]"),
+    )
+
+class JitteredRetry(Retry):
+    """Retry adding random jitter to the backoff, so threads failing together don't retry in lockstep."""
+    # urllib3 2.x has this as the backoff_jitter argument, 1.26 does not
+    BACKOFF_JITTER = 0.5
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, self.BACKOFF_JITTER) if backoff else backoff
+
 class OptimizedMangaku:
     """Optimized Mangaku scraper with performance enhancements."""
     
-    def __init__(self, max_retries=3, timeout=120, pool_connections=20, pool_maxsize=50):
+    # XPath expressions are compiled once and shared by every request
+    _XP_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+    _XP_LIST_CARDS = _card_columns('bsx')
+    _XP_SEARCH_CARDS = _card_columns('bs')
+    _XP_TITLE = etree.XPath("string((.//a)[1]/@title)", smart_strings=False)
+    _XP_HREF = etree.XPath("string((.//a)[1]/@href)", smart_strings=False)
+    _XP_IMG = etree.XPath("string((.//img)[1]/@src)", smart_strings=False)
+    _XP_SCORE = etree.XPath(f"(.//div[{_has_class('numscore')}])[1]")
+    _XP_EPXS = etree.XPath(f"(.//div[{_has_class('epxs')}])[1]")
+    _XP_ENTRY_TITLE = etree.XPath(f"(//h1[{_has_class('entry-title')}])[1]")
+    _XP_COVER = etree.XPath("string((//img[@class='attachment- size- wp-post-image'])[1]/@src)", smart_strings=False)
+    _XP_RATING = etree.XPath(f"(//div[{_has_class('num')}])[1]")
+    _XP_GENRES = etree.XPath(f"//span[{_has_class('mgen')}]//a")
+    _XP_SYNOPSIS = etree.XPath("(//div[@class='entry-content entry-content-single'])[1]")
+    _XP_CHAPTERS = etree.XPath(f"//div[{_has_class('eph-num')}]")
+    _XP_CHAPTER_HREFS = etree.XPath("$chapters/descendant::a[1]/@href", smart_strings=False)
+    _XP_INFO = etree.XPath("(//div[@class='tsinfo bixbox'])[1]")
+    
+    def __init__(self, max_retries=3, timeout=120, pool_connections=20, pool_maxsize=50, dns_cache_ttl=300,
+                 http2=False, revalidation_cache_size=128):
         self.base_url = 'https://mangaaku.com'
         self.headers = headers
         self.komik_schema = KomikSchema()
         self.komik_detail_schema = KomikDetailSchema()
         self.timeout = timeout
         self.max_retries = max_retries
+        self.dns_cache_ttl = dns_cache_ttl
         
-        self.session = self._create_session(pool_connections, pool_maxsize)
+        self.http2 = False
+        if http2:
+            self.session = self._create_http2_session(pool_connections, pool_maxsize)
+        if not self.http2:
+            self.session = self._create_session(pool_connections, pool_maxsize)
         
         self._lock = threading.Lock()
+        # Caps in-flight upstream requests at the pool size so concurrent
+        # callers never open throwaway connections or hammer the origin
+        self._request_slots = threading.BoundedSemaphore(pool_maxsize)
+        
+        # Conditional GET: validators and last good response per listing URL, so
+        # an unchanged page costs an empty 304 instead of a download and parse.
+        # Detail and chapter pages are cached in Redis by the app, not held here
+        self._revalidation_cache = {}
+        self.revalidation_cache_size = revalidation_cache_size
         
         self.request_count = 0
         self.cache_hits = 0
@@ -39,11 +134,15 @@ class OptimizedMangaku:
         """Create optimized requests session with connection pooling and retry strategy."""
         session = requests.Session()
         
-        retry_strategy = Retry(
+        if self.dns_cache_ttl:
+            install_dns_cache(self.dns_cache_ttl)
+        
+        retry_strategy = JitteredRetry(
             total=self.max_retries,
-            status_forcelist=[429, 500, 502, 503, 504, 520, 521, 522, 523, 524],
-            method_whitelist=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["HEAD", "GET", "OPTIONS"]),
+            backoff_factor=0.3,
+            respect_retry_after_header=True,
             raise_on_status=False
         )
         
@@ -56,10 +155,46 @@ class OptimizedMangaku:
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         session.headers.update(self.headers)
+        # gzip/deflate, plus br when a brotli decoder is installed
+        session.headers.update(urllib3.util.make_headers(accept_encoding=True))
         
         return session
     
-    def _make_request(self, url, **kwargs):
+    def _create_http2_session(self, pool_connections, pool_maxsize):
+        """Create an httpx client multiplexing requests over HTTP/2, or None if unavailable."""
+        if httpx is None:
+            logger.warning("HTTP/2 requested but httpx is not installed, falling back to requests")
+            return None
+        try:
+            # Transport retries cover connection failures only, not retryable statuses
+            transport = httpx.HTTPTransport(
+                http2=True,
+                verify=False,
+                retries=self.max_retries,
+                limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_connections)
+            )
+            client = httpx.Client(transport=transport, headers=self.headers, follow_redirects=True)
+        except ImportError:
+            logger.warning("HTTP/2 requested but h2 is not installed, falling back to requests")
+            return None
+        self.http2 = True
+        return client
+    
+    def _get(self, url, timeout_settings, **kwargs):
+        """Send a GET with whichever client backs the session."""
+        if self.http2:
+            connect_timeout, read_timeout = timeout_settings
+            return self.session.get(url, timeout=httpx.Timeout(read_timeout, connect=connect_timeout), **kwargs)
+        return self.session.get(
+            url,
+            timeout=timeout_settings,
+            verify=False,
+            stream=False,
+            allow_redirects=True,
+            **kwargs
+        )
+    
+    def _make_request(self, url, revalidate=False, **kwargs):
         """Make optimized HTTP request with error handling and metrics."""
         with self._lock:
             self.request_count += 1
@@ -68,17 +203,40 @@ class OptimizedMangaku:
         
         timeout_settings = (30, self.timeout)
         
+        cached = self._revalidation_cache.get(url) if revalidate else None
+        if cached:
+            kwargs['headers'] = {**kwargs.get('headers', {}), **cached['validators']}
+        
+        with self._request_slots:
+            response = self._send_request(url, timeout_settings, start_time, **kwargs)
+        return self._revalidate(url, response, cached) if revalidate else response
+    
+    def _revalidate(self, url, response, cached):
+        """Swap a 304 for the stored response and remember the validators of fresh ones."""
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.cache_hits += 1
+            return cached['response']
+        
+        if response.status_code == 200:
+            validators = {}
+            if response.headers.get('ETag'):
+                validators['If-None-Match'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            if validators:
+                with self._lock:
+                    if len(self._revalidation_cache) >= self.revalidation_cache_size:
+                        self._revalidation_cache.clear()
+                    self._revalidation_cache[url] = {'validators': validators, 'response': response, 'parsed': {}}
+        return response
+    
+    def _send_request(self, url, timeout_settings, start_time, **kwargs):
+        """Send GET request, retrying once with a longer timeout on read timeout."""
         try:
-            response = self.session.get(
-                url,
-                timeout=timeout_settings,
-                verify=False,
-                stream=False,
-                allow_redirects=True,
-                **kwargs
-            )
+            response = self._get(url, timeout_settings, **kwargs)
             
-            if response.status_code == 200:
+            if response.status_code in (200, 304):
                 duration = time.time() - start_time
                 logger.debug(f"Request to {url} completed in {duration:.3f}s")
                 return response
@@ -86,19 +244,12 @@ class OptimizedMangaku:
                 logger.warning(f"Request to {url} returned status {response.status_code}")
                 return response
         
-        except requests.exceptions.ReadTimeout as e:
+        except _READ_TIMEOUT_ERRORS as e:
             duration = time.time() - start_time
             logger.warning(f"Read timeout for {url} after {duration:.3f}s, retrying with longer timeout")
             
             try:
-                response = self.session.get(
-                    url,
-                    timeout=(60, 180),
-                verify=False,
-                    stream=False,
-                    allow_redirects=True,
-                    **kwargs
-                )
+                response = self._get(url, (60, 180), **kwargs)
                 duration = time.time() - start_time
                 logger.info(f"Retry successful for {url} after {duration:.3f}s")
                 return response
@@ -106,12 +257,12 @@ class OptimizedMangaku:
                 logger.error(f"Final retry failed for {url}: {str(retry_e)}")
                 raise
         
-        except requests.exceptions.ConnectTimeout as e:
+        except _CONNECT_TIMEOUT_ERRORS as e:
             duration = time.time() - start_time
             logger.error(f"Connection timeout for {url} after {duration:.3f}s: {str(e)}")
             raise
             
-        except requests.exceptions.RequestException as e:
+        except _REQUEST_ERRORS as e:
             duration = time.time() - start_time
             logger.error(f"Request to {url} failed after {duration:.3f}s: {str(e)}")
             raise
@@ -119,19 +270,9 @@ class OptimizedMangaku:
     @lru_cache(maxsize=128)
     def _parse_manga_info(self, manga_type_text):
         """Parse manga info with caching for repeated patterns."""
-        patterns = {
-            "status": r"Status\s+(\w+)",
-            "type": r"Type\s+(\w+)",
-            "author": r"Author\s+([^P]+?)\s+Posted By",
-            "posted_by": r"Posted By\s+(\w+)",
-            "posted_on": r"Posted On\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})",
-            "updated_on": r"Updated On\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})",
-            "views": r"Views\s+(\S+)"
-        }
-        
         result = {}
-        for key, pattern in patterns.items():
-            match = re.search(pattern, manga_type_text)
+        for key, pattern in _INFO_PATTERNS:
+            match = pattern.search(manga_type_text)
             if match:
                 result[key] = match.group(1).strip()
         return result
@@ -141,26 +282,14 @@ class OptimizedMangaku:
         url = f'{self.base_url}/manga/?page={page}&order=update'
         
         try:
-            response = self._make_request(url)
-            
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            manga_elements = soup.find_all('div', class_="bsx")
+            response = self._make_request(url, revalidate=True)
             
-            if limit:
-                manga_elements = manga_elements[:limit]
-            
-            manga_list_data = []
-            
-            for element in manga_elements:
-                try:
-                    manga_data = self._parse_manga_element(element)
-                    if manga_data:
-                        serialized_manga = self.komik_schema.dump(manga_data)
-                        manga_list_data.append(serialized_manga)
-                except Exception as e:
-                    logger.warning(f"Failed to parse manga element: {str(e)}")
-                    continue
+            # A revalidated page is the stored response, so its earlier parse still holds
+            cached = self._revalidation_cache.get(url)
+            parsed = cached['parsed'] if cached and cached['response'] is response else {}
+            if limit not in parsed:
+                parsed[limit] = self._parse_list_bytes(response.content, limit, self._response_charset(response))
+            manga_list_data = parsed[limit]
             
             logger.info(f"Successfully parsed {len(manga_list_data)} manga items from page {page}")
             return manga_list_data
@@ -169,42 +298,121 @@ class OptimizedMangaku:
             logger.error(f"Error fetching manga list for page {page}: {str(e)}")
             return None
     
+    def _response_charset(self, response):
+        """Charset declared in the Content-Type header of a response, if any."""
+        match = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+        return match.group(1) if match else None
+    
+    def _parse_html(self, body, charset=None):
+        """Parse raw HTML bytes, decoding with the HTTP charset, the page's meta charset or UTF-8."""
+        if charset:
+            try:
+                # lxml parsers are not thread-safe, so each parse gets its own
+                return html.fromstring(body, parser=html.HTMLParser(encoding=charset))
+            except LookupError:
+                logger.warning(f"Unknown charset {charset}, falling back to detection")
+        if _META_CHARSET_RE.search(body, 0, 2048):
+            return html.fromstring(body)
+        # Without any declaration libxml2 would guess latin-1
+        return html.fromstring(body, parser=html.HTMLParser(encoding='utf-8'))
+    
+    def _parse_list_bytes(self, body, limit=None, charset=None):
+        """Parse and serialize the manga cards of a raw listing page."""
+        tree = self._parse_html(body, charset)
+        
+        manga_list_data = []
+        
+        for manga_data in self._parse_manga_cards(tree, self._XP_LIST_CARDS, limit):
+            try:
+                if manga_data:
+                    serialized_manga = serialize_komik(manga_data)
+                    manga_list_data.append(serialized_manga)
+            except Exception as e:
+                logger.warning(f"Failed to parse manga element: {str(e)}")
+                continue
+        
+        return manga_list_data
+    
+    async def get_manga_list_async(self, pages, limit: int = None, max_connections: int = 20):
+        """Get several manga list pages concurrently; failed pages come back as None."""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for get_manga_list_async")
+        
+        loop = asyncio.get_running_loop()
+        timeout = aiohttp.ClientTimeout(connect=30, sock_read=self.timeout)
+        connector = aiohttp.TCPConnector(limit=max_connections, ssl=False)
+        
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=timeout) as session:
+            async def fetch(page):
+                url = f'{self.base_url}/manga/?page={page}&order=update'
+                try:
+                    async with session.get(url) as response:
+                        body = await response.read()
+                        charset = response.charset
+                    # Parsing is CPU-bound, keep it off the event loop
+                    manga_list_data = await loop.run_in_executor(None, self._parse_list_bytes, body, limit, charset)
+                    logger.info(f"Successfully parsed {len(manga_list_data)} manga items from page {page}")
+                    return manga_list_data
+                except Exception as e:
+                    logger.error(f"Error fetching manga list for page {page}: {str(e)}")
+                    return None
+            
+            return await asyncio.gather(*(fetch(page) for page in pages))
+    
+    def _parse_manga_cards(self, tree, columns, limit=None):
+        """Parse the manga cards of a listing page with one XPath evaluation per field."""
+        xp_cards, *xp_fields = columns
+        cards = xp_cards(tree)
+        fields = [xp_field(tree, cards=cards) for xp_field in xp_fields]
+        
+        if any(len(field) != len(cards) for field in fields):
+            # Some card lacks a field, so the columns would not line up
+            return [self._parse_manga_element(element) for element in (cards[:limit] if limit else cards)]
+        
+        rows = list(zip(*fields))[:limit] if limit else zip(*fields)
+        return [
+            self._build_manga(link.get('title', ''), link.get('href', ''), image,
+                              self._safe_get_text(rating), self._safe_get_text(chapter))
+            for link, image, rating, chapter in rows
+        ]
+    
     def _parse_manga_element(self, element):
         """Parse individual manga element with error handling."""
         try:
-            title_elem = element.find('a')
-            manga_title = title_elem.get('title', '') if title_elem else ''
-            manga_url = title_elem.get('href', '') if title_elem else ''
-            
-            img_elem = element.find('img')
-            manga_image = img_elem.get('src', '') if img_elem else ''
-            
-            rating_element = element.find('div', class_="numscore")
-            manga_rating = rating_element.text.strip() if rating_element else "0"
-            
-            chapter_element = element.find('div', class_="epxs")
-            manga_chapter = chapter_element.text.strip() if chapter_element else "0"
-            
-            chapter_num = re.findall(r'\d+', manga_chapter)
-            total_chapter = int(chapter_num[0]) if chapter_num else 0
+            manga_title = self._XP_TITLE(element)
+            manga_url = self._XP_HREF(element)
+            manga_image = self._XP_IMG(element)
             
-            try:
-                rating_float = float(manga_rating) if manga_rating and manga_rating not in ['-', '', '0'] else 0.0
-            except (ValueError, TypeError):
-                rating_float = 0.0
+            rating_element = self._XP_SCORE(element)
+            manga_rating = self._safe_get_text(rating_element[0]) if rating_element else "0"
             
-            return {
-                'id': manga_url.replace(self.base_url, '').strip('/'),
-                'title': manga_title,
-                'image': manga_image,
-                'total_chapter': total_chapter,
-                'rating': rating_float
-            }
+            chapter_element = self._XP_EPXS(element)
+            manga_chapter = self._safe_get_text(chapter_element[0]) if chapter_element else "0"
             
+            return self._build_manga(manga_title, manga_url, manga_image, manga_rating, manga_chapter)
+        
         except Exception as e:
             logger.warning(f"Failed to parse manga element: {str(e)}")
             return None
     
+    def _build_manga(self, manga_title, manga_url, manga_image, manga_rating, manga_chapter):
+        """Build a manga record from the raw strings of one card."""
+        chapter_num = _DIGITS_RE.search(manga_chapter)
+        total_chapter = int(chapter_num.group()) if chapter_num else 0
+        
+        try:
+            rating_float = float(manga_rating) if manga_rating and manga_rating not in ['-', '', '0'] else 0.0
+        except (ValueError, TypeError):
+            rating_float = 0.0
+        
+        return KomikRecord(
+            id=manga_url.removeprefix(self.base_url).strip('/'),
+            title=manga_title,
+            image=manga_image,
+            total_chapter=total_chapter,
+            rating=rating_float
+        )
+    
     def get_manga_detail(self, manga_url: str):
         """Get manga detail with performance optimizations."""
         url = f'{self.base_url}/manga/{manga_url}'
@@ -213,57 +421,34 @@ class OptimizedMangaku:
             logger.info(f"Fetching manga detail for: {manga_url}")
             response = self._make_request(url)
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            tree = self._parse_html(response.content, self._response_charset(response))
             
-            title_elem = soup.find('h1', class_="entry-title")
-            manga_title = title_elem.text.strip() if title_elem else "Unknown Title"
+            title_elem = self._XP_ENTRY_TITLE(tree)
+            manga_title = self._safe_get_text(title_elem[0]) if title_elem else "Unknown Title"
             
-            img_element = soup.find('img', class_="attachment- size- wp-post-image")
-            manga_image = img_element.get('src', '') if img_element else ""
+            manga_image = self._XP_COVER(tree)
             
-            rating_element = soup.find('div', class_="num")
-            manga_rating = rating_element.text.strip() if rating_element else "0"
+            rating_element = self._XP_RATING(tree)
+            manga_rating = self._safe_get_text(rating_element[0]) if rating_element else "0"
             
-            genre_elements = soup.find_all('span', class_="mgen")
-            genre = []
-            for elem in genre_elements:
-                try:
-                    link = elem.find_all('a')
-                    for link in link:
-                        if link and link.text:
-                            genre.append(link.text.strip())
-                except:
-                    continue
+            genre = [text for text in (link.text_content().strip() for link in self._XP_GENRES(tree)) if text]
             
-            synopsis_element = soup.find('div', class_="entry-content entry-content-single")
-            manga_synopsis = ""
-            if synopsis_element:
-                for script in synopsis_element(["script", "style"]):
-                    script.decompose()
-                manga_synopsis = synopsis_element.get_text().strip()
+            synopsis_element = self._XP_SYNOPSIS(tree)
+            manga_synopsis = self._safe_get_text(synopsis_element[0]) if synopsis_element else ""
             
-            chapter_elements = soup.findAll('div', class_="eph-num")
-            chapter_list = []
-            
-            for elem in chapter_elements[1:] if len(chapter_elements) > 1 else chapter_elements:
-                try:
-                    link = elem.find('a')
-                    if link and link.get('href'):
-                        chapter_url = link['href'].replace(self.base_url, 'read')
-                        if chapter_url:
-                            chapter_list.append(chapter_url)
-                except:
-                    continue
+            chapter_elements = self._XP_CHAPTERS(tree)
+            chapter_hrefs = self._XP_CHAPTER_HREFS(
+                tree, chapters=chapter_elements[1:] if len(chapter_elements) > 1 else chapter_elements)
+            base_url = self.base_url
+            chapter_list = [
+                f"read{href.removeprefix(base_url)}" if href.startswith(base_url) else href
+                for href in chapter_hrefs if href
+            ]
             
             total_chapters = len(chapter_list)
             
-            manga_type_elements = soup.find_all('div', class_="tsinfo bixbox")
-            manga_type_text = ""
-            if manga_type_elements:
-                try:
-                    manga_type_text = re.sub(r'\s+', ' ', manga_type_elements[0].get_text().strip())
-                except:
-                    manga_type_text = ""
+            info_element = self._XP_INFO(tree)
+            manga_type_text = _WS_RE.sub(' ', self._safe_get_text(info_element[0])) if info_element else ""
             
             result = self._parse_manga_info(manga_type_text) if manga_type_text else {}
             
@@ -272,49 +457,44 @@ class OptimizedMangaku:
             
             year = self._extract_year(result)
             
-            manga_detail_data = {
-                'id': manga_url.strip('/'),
-                'title': manga_title,
-                'image': manga_image,
-                'description': manga_synopsis[:100] + "..." if len(manga_synopsis) > 100 else manga_synopsis,
-                'synopsis': manga_synopsis,
-                'type': result.get('type', 'Manga'),
-                'status': result.get('status', 'Unknown'),
-                'year': year,
-                'genre': genre,
-                'chapter': total_chapters,
-                'chapter_list': chapter_list,
-                'author': result.get('author', 'Unknown'),
-                'rating': manga_rating,
-                'views': views_num
-            }
+            description = f"{manga_synopsis[:100]}..." if len(manga_synopsis) > 100 else manga_synopsis
+            
+            manga_detail_data = KomikDetailRecord(
+                id=manga_url.strip('/'),
+                title=manga_title,
+                image=manga_image,
+                description=description,
+                synopsis=manga_synopsis,
+                type=result.get('type', 'Manga'),
+                status=result.get('status', 'Unknown'),
+                year=year,
+                genre=genre,
+                chapter=total_chapters,
+                chapter_list=chapter_list,
+                author=result.get('author', 'Unknown'),
+                rating=manga_rating,
+                views=views_num
+            )
             
-            serialized_manga = self.komik_detail_schema.dump(manga_detail_data)
+            serialized_manga = serialize_komik_detail(manga_detail_data)
             logger.info(f"Successfully parsed manga detail for {manga_url}")
             return serialized_manga
             
         except Exception as e:
             logger.error(f"Error fetching manga detail for {manga_url}: {str(e)}")
             return None
-        
+    
     def _safe_get_text(self, element):
-        """Safely get text from BeautifulSoup element."""
-        return element.text.strip() if element else ""
+        """Safely get the visible text of an lxml element, skipping scripts and styles."""
+        return ''.join(self._XP_TEXT(element)).strip() if element is not None else ""
     
     def _parse_views(self, views_str):
         """Parse view count with K/M suffix handling."""
-        try:
-            views_clean = views_str.replace(',', '')
-            
-            if 'K' in views_clean:
-                return int(float(views_clean.replace('K', '')) * 1000)
-            elif 'M' in views_clean:
-                return int(float(views_clean.replace('M', '')) * 1000000)
-            else:
-                numbers = re.findall(r'\d+', views_clean)
-                return int(numbers[0]) if numbers else 0
-        except:
+        views_match = _VIEWS_RE.search(views_str.replace(',', ''))
+        if not views_match:
             return 0
+        number, suffix = views_match.groups()
+        return int(float(number) * _VIEWS_MULTIPLIERS[suffix])
     
     def _extract_year(self, result):
         """Extract year from date strings."""
@@ -322,7 +502,7 @@ class OptimizedMangaku:
         
         for date_key in ['posted_on', 'updated_on']:
             if result.get(date_key):
-                year_match = re.search(r'\d{4}', result[date_key])
+                year_match = _YEAR_RE.search(result[date_key])
                 if year_match:
                     return int(year_match.group())
         
@@ -334,17 +514,8 @@ class OptimizedMangaku:
         
         try:
             response = self._make_request(url)
-            soup = BeautifulSoup(response.text, 'lxml')
-            all_data = soup.find_all('div', class_="bs")
-            manga_list = []
-            try:
-                for element in all_data:
-                    manga_data = self._parse_manga_element(element)
-                    if manga_data:
-                        manga_list.append(manga_data)
-            except:
-                logger.error(f"Failed to parse manga element: {str(e)}")
-                return []
+            tree = self._parse_html(response.content, self._response_charset(response))
+            manga_list = [serialize_komik(manga_data) for manga_data in self._parse_manga_cards(tree, self._XP_SEARCH_CARDS) if manga_data]
             logger.info(f"Successfully parsed {len(manga_list)} manga items")
             return manga_list
         except:
@@ -358,41 +529,22 @@ class OptimizedMangaku:
             logger.info(f"Fetching chapter images for: {manga_url}")
             response = self._make_request(url)
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            tree = self._parse_html(response.content, self._response_charset(response))
             
-            title_elem = soup.find('h1', class_="entry-title")
-            manga_title = title_elem.text.strip() if title_elem else "Unknown Chapter"
+            title_elem = self._XP_ENTRY_TITLE(tree)
+            manga_title = self._safe_get_text(title_elem[0]) if title_elem else "Unknown Chapter"
 
             try:
-                comic_data = parse_comic(response.text)
+                comic_data = parse_comic(response.content)
                 sources = comic_data.get('sources', []) if comic_data else []
             except Exception as e:
                 logger.error(f"Failed to parse comic data: {str(e)}")
                 sources = []
             
-            server_list = {}
-            
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                future_to_server = {}
-                
-                for i, source in enumerate(sources[:3]):  # Limit to 3 servers
-                    server_name = f'Server {i + 1}'
-                    future = executor.submit(self._extract_images_from_source, source)
-                    future_to_server[future] = server_name
-                
-                for future in as_completed(future_to_server, timeout=30):
-                    server_name = future_to_server[future]
-                    try:
-                        images = future.result(timeout=10)
-                        server_list[server_name] = images
-                    except Exception as e:
-                        logger.warning(f"Failed to extract images for {server_name}: {str(e)}")
-                        server_list[server_name] = []
-            
-            for i in range(1, 4):
-                server_name = f'Server {i}'
-                if server_name not in server_list:
-                    server_list[server_name] = []
+            # Stripping a few image lists is microseconds of work, cheaper inline than on threads
+            server_list = {f'Server {i}': [] for i in range(1, 4)}
+            for i, source in enumerate(sources[:3]):  # Limit to 3 servers
+                server_list[f'Server {i + 1}'] = self._extract_images_from_source(source)
             
             result = {
                 'title': manga_title,
@@ -410,11 +562,7 @@ class OptimizedMangaku:
         """Extract images from a single source."""
         try:
             if isinstance(source, dict) and 'images' in source:
-                images = []
-                for img in source['images']:
-                    if img and img.strip():
-                        images.append(img.strip())
-                return images
+                return [img.strip() for img in source['images'] if img and img.strip()]
             return []
         except Exception as e:
             logger.warning(f"Failed to extract images from source: {str(e)}")
@@ -431,6 +579,8 @@ class OptimizedMangaku:
     def clear_cache(self):
         """Clear internal caches."""
         self._parse_manga_info.cache_clear()
+        with self._lock:
+            self._revalidation_cache.clear()
         logger.info("Internal caches cleared")
     
     def close(self):
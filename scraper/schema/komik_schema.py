@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from marshmallow import Schema, fields, EXCLUDE
 
 class KomikDetailSchema(Schema):
@@ -27,4 +28,61 @@ class KomikSchema(Schema):
     title = fields.String(required=True)
     image = fields.String(required=True)
     total_chapter = fields.Integer(required=True)
-    rating = fields.Float(required=True)
\ No newline at end of file
+    rating = fields.Float(required=True)
+
+# Scraped records, slotted so a page of them is a handful of fixed-layout
+# objects instead of one hash table per manga
+@dataclass(slots=True, frozen=True)
+class KomikRecord:
+    id: str
+    title: str
+    image: str
+    total_chapter: int
+    rating: float
+
+@dataclass(slots=True, frozen=True)
+class KomikDetailRecord:
+    id: str
+    title: str
+    image: str
+    description: str
+    synopsis: str
+    type: str
+    status: str
+    year: int
+    genre: list
+    chapter: int
+    chapter_list: list
+    author: str
+    rating: str
+    views: int
+
+# Hand-written equivalents of KomikSchema().dump / KomikDetailSchema().dump,
+# turning records into the API payload; only the field projection and type
+# coercion are kept
+def serialize_komik(record):
+    return {
+        'id': str(record.id),
+        'title': str(record.title),
+        'image': str(record.image),
+        'total_chapter': int(record.total_chapter),
+        'rating': float(record.rating)
+    }
+
+def serialize_komik_detail(record):
+    return {
+        'id': str(record.id),
+        'title': str(record.title),
+        'image': str(record.image),
+        'description': str(record.description),
+        'synopsis': str(record.synopsis),
+        'type': str(record.type),
+        'status': str(record.status),
+        'year': int(record.year),
+        'genre': [str(genre) for genre in record.genre],
+        'chapter': int(record.chapter),
+        'chapter_list': [str(chapter) for chapter in record.chapter_list],
+        'author': str(record.author),
+        'rating': str(record.rating),
+        'views': int(record.views)
+    }
@@ -0,0 +1,60 @@
+import socket
+import threading
+import time
+import urllib3.util.connection as urllib3_connection
+
+_original_create_connection = urllib3_connection.create_connection
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_dns_ttl = 300
+
+
+def _resolve(host, port):
+    """Resolve host to a list of IPs, reusing results for the cache TTL."""
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get((host, port))
+        if entry and entry[0] > now:
+            return entry[1]
+
+    family = urllib3_connection.allowed_gai_family()
+    infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+
+    with _dns_lock:
+        _dns_cache[(host, port)] = (now + _dns_ttl, addresses)
+    return addresses
+
+
+def _cached_create_connection(address, *args, **kwargs):
+    """urllib3 create_connection that connects to cached addresses in order."""
+    host, port = address
+    try:
+        addresses = _resolve(host, port)
+    except socket.gaierror:
+        return _original_create_connection(address, *args, **kwargs)
+
+    error = None
+    for ip in addresses:
+        try:
+            return _original_create_connection((ip, port), *args, **kwargs)
+        except OSError as e:
+            error = e
+
+    # Every cached address failed - drop the entry so the next attempt re-resolves
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+    raise error
+
+
+def install_dns_cache(ttl=300):
+    """Route urllib3 connections through a TTL-cached DNS resolver."""
+    global _dns_ttl
+    _dns_ttl = ttl
+    urllib3_connection.create_connection = _cached_create_connection
+
+
+def clear_dns_cache():
+    """Drop all cached DNS results."""
+    with _dns_lock:
+        _dns_cache.clear()
@@ -1,11 +1,21 @@
-import re
 import json
+import orjson
 
-def parse_comic(html: str):
-    match = re.search(r'ts_reader\.run\((\{.*?\})\);', html, re.S)
-    if match:
-        load_js = match.group(1)
-        js_object = load_js.replace('\\/', '/')
-        data = json.loads(js_object)
-        return data
-    return None
\ No newline at end of file
+_TS_READER_CALL = b'ts_reader.run('
+
+def parse_comic(html: bytes):
+    # Same match as ts_reader\.run\((\{.*?\})\); but located with two
+    # linear substring searches instead of the backtracking regex engine
+    start = html.find(_TS_READER_CALL + b'{')
+    if start != -1:
+        start += len(_TS_READER_CALL)
+        end = html.find(b'});', start)
+        if end != -1:
+            load_js = html[start:end + 1]
+            js_object = load_js.replace(b'\\/', b'/')
+            try:
+                return orjson.loads(js_object)
+            except orjson.JSONDecodeError:
+                # orjson is stricter than the stdlib (e.g. NaN), keep accepting what json does
+                return json.loads(js_object)
+    return None
@@ -4,39 +4,163 @@ Performance monitoring script for Mangaku API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
 import time
-import json
+import orjson
 import sys
 import argparse
 from datetime import datetime
-from typing import Dict, List
-import statistics
+from typing import Dict, Iterator, List, Optional
+import math
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # Optional, load tests fall back to a thread pool
+    aiohttp = None
+
+class LatencyStats:
+    """Streaming response time statistics in constant memory.
+    
+    Count, mean, min and max are exact. Percentiles come from a histogram of
+    log-spaced buckets, each spanning `precision` of its value, so they are
+    accurate to about 1% however long the load test runs.
+    """
+    
+    def __init__(self, precision: float = 0.01, floor: float = 1e-6):
+        self._log_base = math.log1p(precision)
+        self._floor = floor
+        self._buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        """Record one response time."""
+        index = int(math.log(value / self._floor) / self._log_base) if value > self._floor else 0
+        self._buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def extend(self, values: List[float]):
+        """Record a batch of response times with one pass of each builtin."""
+        if not values:
+            return
+        log, floor, log_base = math.log, self._floor, self._log_base
+        self._buckets.update(int(log(value / floor) / log_base) if value > floor else 0 for value in values)
+        self.count += len(values)
+        self.total += sum(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+    
+    def percentiles(self, *percentiles: float) -> List[float]:
+        """Estimate several percentiles in one walk over the histogram buckets.
+        
+        Like numpy's default method, a percentile interpolates linearly
+        between the two samples around its rank; each sample is placed in its
+        bucket by its position among the bucket's samples.
+        """
+        positions = [(percentile / 100) * (self.count - 1) for percentile in percentiles]
+        ranks = sorted({rank for position in positions for rank in (math.floor(position), math.ceil(position))})
+        samples = {}
+        seen = 0
+        for index in sorted(self._buckets):
+            bucket_count = self._buckets[index]
+            lower = self._floor * math.exp(index * self._log_base) if index else 0.0
+            upper = self._floor * math.exp((index + 1) * self._log_base)
+            while ranks and ranks[0] < seen + bucket_count:
+                rank = ranks.pop(0)
+                value = lower + (upper - lower) * (rank - seen + 0.5) / bucket_count
+                samples[rank] = min(max(value, self.min), self.max)
+            seen += bucket_count
+        
+        estimates = []
+        for position in positions:
+            below, above = samples[math.floor(position)], samples[math.ceil(position)]
+            estimates.append(below + (above - below) * (position - math.floor(position)))
+        return estimates
+    
+    def percentile(self, percentile: float) -> float:
+        """Estimate a percentile from the histogram buckets."""
+        return self.percentiles(percentile)[0]
+
+@dataclass(slots=True, frozen=True)
+class Measurement:
+    """Outcome of one load test request; failed requests have an error and no status."""
+    endpoint: str
+    status_code: Optional[int] = None
+    duration: Optional[float] = None
+    size: int = 0
+    success: bool = False
+    preview: Optional[str] = None
+    error: Optional[str] = None
+
+class RequestPacer:
+    """Token bucket spacing the requests of all load test workers to a target rate."""
+    
+    def __init__(self, target_rps: float):
+        self.interval = 1.0 / target_rps
+        self._next_slot = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Claim the next send slot and return how long to wait for it."""
+        with self._lock:
+            now = time.perf_counter()
+            # An idle bucket holds a single token, so a lull is not followed by a burst
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        return slot - now
 
 class APIMonitor:
     """Monitor API performance and health."""
     
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    def __init__(self, base_url: str = "http://localhost:5000", concurrent: int = 1):
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+        self.session = self._create_session(concurrent)
         self.metrics = {
-            'response_times': [],
-            'status_codes': {},
+            'response_times': LatencyStats(),
+            'status_codes': Counter(),
             'error_count': 0,
             'success_count': 0
         }
     
+    def _create_session(self, concurrent: int) -> requests.Session:
+        """Create a session keeping one pooled keep-alive connection per load test worker."""
+        session = requests.Session()
+        
+        # The default pool keeps 10 connections, more workers would reconnect on every request.
+        # No retries: a failing response is measured once, like on the aiohttp path
+        adapter = HTTPAdapter(pool_maxsize=max(concurrent, 10), max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        
+        return session
+    
     def check_health(self) -> Dict:
         """Check API health status."""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             response = self.session.get(f"{self.base_url}/health", timeout=10)
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             return {
                 'status': 'healthy' if response.status_code == 200 else 'unhealthy',
                 'response_time': duration,
                 'status_code': response.status_code,
-                'data': response.json() if response.status_code == 200 else None
+                'data': orjson.loads(response.content) if response.status_code == 200 else None
             }
         except Exception as e:
             return {
@@ -46,115 +170,192 @@ class APIMonitor:
                 'status_code': None
             }
     
-    def test_endpoint(self, endpoint: str, params: Dict = None) -> Dict:
-        """Test a specific endpoint and measure performance."""
-        url = f"{self.base_url}{endpoint}"
-        
+    def test_endpoint(self, endpoint: str, params: Dict = None, prepared=None) -> Measurement:
+        """Test a specific endpoint and measure performance, reusing a `_prepare_request` result if given."""
         try:
-            start_time = time.time()
-            response = self.session.get(url, params=params, timeout=30)
-            duration = time.time() - start_time
+            request, settings = prepared or self._prepare_request(endpoint, params)
+            start_time = time.perf_counter()
+            response = self.session.send(request, timeout=30, **settings)
+            try:
+                # Keep the first chunk for the preview and only count the rest;
+                # draining the body also hands the connection back to the pool
+                chunks = response.iter_content(8192)
+                preview = next(chunks, b'')
+                response_size = len(preview) + sum(len(chunk) for chunk in chunks)
+            finally:
+                response.close()
+            duration = time.perf_counter() - start_time
             
-            # Update metrics
-            self.metrics['response_times'].append(duration)
-            status_code = response.status_code
-            self.metrics['status_codes'][status_code] = self.metrics['status_codes'].get(status_code, 0) + 1
+            return Measurement(
+                endpoint=endpoint,
+                status_code=response.status_code,
+                duration=duration,
+                size=response_size,
+                success=200 <= response.status_code < 300,
+                preview=preview.decode(response.encoding or 'utf-8', errors='replace')[:200] if preview else None
+            )
             
-            if 200 <= status_code < 300:
-                self.metrics['success_count'] += 1
-            else:
-                self.metrics['error_count'] += 1
+        except Exception as e:
+            return Measurement(endpoint=endpoint, error=str(e))
+    
+    async def test_endpoint_async(self, session, endpoint: str, params: Dict = None, url=None) -> Measurement:
+        """Test a specific endpoint on an aiohttp session, reusing a prebuilt `url` if given."""
+        try:
+            url = url or URL(f"{self.base_url}{endpoint}").update_query(params)
+            start_time = time.perf_counter()
+            async with session.get(url) as response:
+                preview = b''
+                response_size = 0
+                async for chunk in response.content.iter_chunked(8192):
+                    preview = preview or chunk
+                    response_size += len(chunk)
+            duration = time.perf_counter() - start_time
             
-            return {
-                'endpoint': endpoint,
-                'status_code': status_code,
-                'response_time': duration,
-                'response_size': len(response.content) if response.content else 0,
-                'success': 200 <= status_code < 300,
-                'headers': dict(response.headers),
-                'data_preview': str(response.text)[:200] if response.text else None
-            }
+            return Measurement(
+                endpoint=endpoint,
+                status_code=response.status,
+                duration=duration,
+                size=response_size,
+                success=200 <= response.status < 300,
+                preview=preview.decode(response.charset or 'utf-8', errors='replace')[:200] if preview else None
+            )
             
         except Exception as e:
-            self.metrics['error_count'] += 1
-            return {
-                'endpoint': endpoint,
-                'error': str(e),
-                'success': False,
-                'response_time': None
-            }
+            return Measurement(endpoint=endpoint, error=str(e))
     
-    def load_test(self, endpoints: List[Dict], duration: int = 60, concurrent: int = 1):
-        """Run load test on specified endpoints."""
+    def _aggregate(self, results: List[Measurement]):
+        """Fold load test measurements into the metrics."""
+        responses = [result for result in results if result.status_code is not None]
+        
+        self.metrics['response_times'].extend([result.duration for result in responses])
+        self.metrics['status_codes'].update(result.status_code for result in responses)
+        
+        success_count = sum(result.success for result in responses)
+        self.metrics['success_count'] += success_count
+        self.metrics['error_count'] += len(results) - success_count
+    
+    def load_test(self, endpoints: List[Dict], duration: int = 60, concurrent: int = 1,
+                  target_rps: float = None) -> List[Measurement]:
+        """Run load test on specified endpoints, as fast as possible unless `target_rps` is given."""
         print(f"🚀 Starting load test for {duration} seconds...")
         print(f"📊 Testing {len(endpoints)} endpoints with {concurrent} concurrent requests")
         
-        start_time = time.time()
+        pacer = None
+        if target_rps:
+            print(f"🎯 Target rate: {target_rps} requests/second")
+            pacer = RequestPacer(target_rps)
+        
+        if aiohttp is None:
+            results = self._load_test_threaded(endpoints, duration, concurrent, pacer)
+        else:
+            results = asyncio.run(self._load_test_async(endpoints, duration, concurrent, pacer))
+        
+        # Workers only measure, the metrics are built here in a single pass
+        self._aggregate(results)
+        return results
+    
+    def _load_test_threaded(self, endpoints: List[Dict], duration: int, concurrent: int,
+                            pacer: RequestPacer = None) -> List[Measurement]:
+        """Cycle through the endpoints from `concurrent` threads sharing the requests session."""
+        # The requests never change, so URLs, query strings and headers are built once
+        prepared = [
+            (endpoint_config['endpoint'],
+             self._prepare_request(endpoint_config['endpoint'], endpoint_config.get('params', {})))
+            for endpoint_config in endpoints
+        ]
+        start_time = time.perf_counter()
+        
+        def worker():
+            results = []
+            while time.perf_counter() - start_time < duration:
+                for endpoint, request in prepared:
+                    if pacer:
+                        time.sleep(pacer.reserve())
+                    results.append(self.test_endpoint(endpoint, prepared=request))
+            return results
+        
+        with ThreadPoolExecutor(max_workers=concurrent) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrent)]
+            return [result for future in futures for result in future.result()]
+    
+    async def _load_test_async(self, endpoints: List[Dict], duration: int, concurrent: int,
+                               pacer: RequestPacer = None) -> List[Measurement]:
+        """Cycle through the endpoints from `concurrent` workers sharing one connection pool."""
         results = []
+        connector = aiohttp.TCPConnector(limit=concurrent)
+        timeout = aiohttp.ClientTimeout(total=30)
         
-        while time.time() - start_time < duration:
-            for endpoint_config in endpoints:
-                endpoint = endpoint_config['endpoint']
-                params = endpoint_config.get('params', {})
-                
-                result = self.test_endpoint(endpoint, params)
-                results.append(result)
-                
-                # Rate limiting - small delay between requests
-                time.sleep(0.1)
+        # The URLs never change, so each query string is encoded once
+        urls = [
+            (endpoint_config['endpoint'],
+             URL(f"{self.base_url}{endpoint_config['endpoint']}").update_query(endpoint_config.get('params', {})))
+            for endpoint_config in endpoints
+        ]
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            
+            async def worker():
+                while loop.time() - start_time < duration:
+                    for endpoint, url in urls:
+                        if pacer:
+                            await asyncio.sleep(pacer.reserve())
+                        result = await self.test_endpoint_async(session, endpoint, url=url)
+                        results.append(result)
+            
+            await asyncio.gather(*(worker() for _ in range(concurrent)))
         
         return results
     
-    def generate_report(self, results: List[Dict]) -> str:
+    def generate_report(self, results: List[Measurement]) -> str:
         """Generate performance report."""
-        if not self.metrics['response_times']:
-            return "❌ No data collected"
+        return "\n".join(self.generate_report_lines(results))
+    
+    def generate_report_lines(self, results: List[Measurement]) -> Iterator[str]:
+        """Generate the performance report line by line."""
+        if not self.metrics['response_times'].count:
+            yield "❌ No data collected"
+            return
         
         response_times = self.metrics['response_times']
+        avg_time, max_time = response_times.mean, response_times.max
+        median, p95 = response_times.percentiles(50, 95)
+        error_rate = self.metrics['error_count'] / (self.metrics['success_count'] + self.metrics['error_count'])
         
-        report = [
-            "=" * 60,
-            "📊 MANGAKU API PERFORMANCE REPORT",
-            "=" * 60,
-            f"⏱️  Test Duration: {len(results)} requests",
-            f"✅ Success Rate: {self.metrics['success_count']}/{len(results)} ({(self.metrics['success_count']/len(results)*100):.1f}%)",
-            f"❌ Error Rate: {self.metrics['error_count']}/{len(results)} ({(self.metrics['error_count']/len(results)*100):.1f}%)",
-            "",
-            "📈 RESPONSE TIME STATISTICS:",
-            f"   • Average: {statistics.mean(response_times):.3f}s",
-            f"   • Median: {statistics.median(response_times):.3f}s",
-            f"   • Min: {min(response_times):.3f}s",
-            f"   • Max: {max(response_times):.3f}s",
-            f"   • 95th Percentile: {self._percentile(response_times, 95):.3f}s",
-            "",
-            "📊 STATUS CODE DISTRIBUTION:"
-        ]
+        yield "=" * 60
+        yield "📊 MANGAKU API PERFORMANCE REPORT"
+        yield "=" * 60
+        yield f"⏱️  Test Duration: {len(results)} requests"
+        yield f"✅ Success Rate: {self.metrics['success_count']}/{len(results)} ({(self.metrics['success_count']/len(results)*100):.1f}%)"
+        yield f"❌ Error Rate: {self.metrics['error_count']}/{len(results)} ({(self.metrics['error_count']/len(results)*100):.1f}%)"
+        yield ""
+        yield "📈 RESPONSE TIME STATISTICS:"
+        yield f"   • Average: {avg_time:.3f}s"
+        yield f"   • Median: {median:.3f}s"
+        yield f"   • Min: {response_times.min:.3f}s"
+        yield f"   • Max: {max_time:.3f}s"
+        yield f"   • 95th Percentile: {p95:.3f}s"
+        yield ""
+        yield "📊 STATUS CODE DISTRIBUTION:"
         
         for status_code, count in sorted(self.metrics['status_codes'].items()):
             percentage = (count / len(results)) * 100
-            report.append(f"   • {status_code}: {count} ({percentage:.1f}%)")
-        
-        report.extend([
-            "",
-            "🔍 PERFORMANCE ANALYSIS:",
-            self._analyze_performance(response_times),
-            "",
-            "⚡ OPTIMIZATION RECOMMENDATIONS:",
-            self._get_recommendations(response_times, self.metrics)
-        ])
+            yield f"   • {status_code}: {count} ({percentage:.1f}%)"
         
-        return "\n".join(report)
+        yield ""
+        yield "🔍 PERFORMANCE ANALYSIS:"
+        yield self._analyze_performance(avg_time)
+        yield ""
+        yield "⚡ OPTIMIZATION RECOMMENDATIONS:"
+        yield self._get_recommendations(avg_time, max_time, error_rate)
     
-    def _percentile(self, data: List[float], percentile: float) -> float:
+    def _percentile(self, data: LatencyStats, percentile: float) -> float:
         """Calculate percentile of response times."""
-        sorted_data = sorted(data)
-        index = int((percentile / 100) * len(sorted_data))
-        return sorted_data[min(index, len(sorted_data) - 1)]
+        return data.percentile(percentile)
     
-    def _analyze_performance(self, response_times: List[float]) -> str:
+    def _analyze_performance(self, avg_time: float) -> str:
         """Analyze performance and provide insights."""
-        avg_time = statistics.mean(response_times)
-        
         if avg_time < 0.5:
             return "🟢 Excellent - Response times are very fast"
         elif avg_time < 1.0:
@@ -164,11 +365,9 @@ class APIMonitor:
         else:
             return "🔴 Poor - Response times need optimization"
     
-    def _get_recommendations(self, response_times: List[float], metrics: Dict) -> str:
+    def _get_recommendations(self, avg_time: float, max_time: float, error_rate: float) -> str:
         """Generate optimization recommendations."""
         recommendations = []
-        avg_time = statistics.mean(response_times)
-        error_rate = metrics['error_count'] / (metrics['success_count'] + metrics['error_count'])
         
         if avg_time > 1.0:
             recommendations.append("• Consider implementing more aggressive caching")
@@ -178,7 +377,7 @@ class APIMonitor:
             recommendations.append("• Investigate error causes and improve error handling")
             recommendations.append("• Consider implementing circuit breakers")
         
-        if max(response_times) > 5.0:
+        if max_time > 5.0:
             recommendations.append("• Implement request timeouts and retries")
             recommendations.append("• Consider async processing for heavy operations")
         
@@ -219,16 +418,19 @@ def main():
     parser.add_argument('--mode', choices=['health', 'load', 'monitor'], default='health',
                        help='Monitoring mode')
     parser.add_argument('--duration', type=int, default=60, help='Load test duration in seconds')
+    parser.add_argument('--concurrent', type=int, default=1, help='Concurrent requests during load test')
+    parser.add_argument('--rps', type=float, help='Target load test request rate (default: unthrottled)')
     parser.add_argument('--interval', type=int, default=30, help='Real-time monitoring interval')
     
     args = parser.parse_args()
     
-    monitor = APIMonitor(args.url)
+    monitor = APIMonitor(args.url, args.concurrent)
     
     if args.mode == 'health':
         print("🏥 Checking API Health...")
         health = monitor.check_health()
-        print(json.dumps(health, indent=2))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(health, option=orjson.OPT_INDENT_2) + b'\n')
         
         if health['status'] != 'healthy':
             sys.exit(1)
@@ -240,15 +442,16 @@ def main():
             {'endpoint': '/health'},
         ]
         
-        results = monitor.load_test(endpoints, args.duration)
-        report = monitor.generate_report(results)
-        print(report)
+        results = monitor.load_test(endpoints, args.duration, args.concurrent, args.rps)
+        report = [line.encode() + b'\n' for line in monitor.generate_report_lines(results)]
+        sys.stdout.flush()
+        sys.stdout.buffer.writelines(report)
         
         # Save report to file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"performance_report_{timestamp}.txt"
-        with open(filename, 'w') as f:
-            f.write(report)
+        with open(filename, 'wb') as f:
+            f.writelines(report)
         print(f"\n📄 Report saved to: {filename}")
     
     elif args.mode == 'monitor':